@@ -19,6 +19,12 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--storage", type=str, choices=["local", "s3", "both"], help="Override storage mode")
     p.add_argument("--s3-bucket", type=str, help="Override aws.s3_bucket")
     p.add_argument("--region", type=str, help="Override aws.region")
+    p.add_argument(
+        "--parallel-datasets",
+        type=int,
+        default=1,
+        help="Process up to N datasets concurrently in separate processes (default: 1)",
+    )
     return p.parse_args()
 
 
@@ -34,7 +40,7 @@ def main() -> None:
     if args.region:
         overrides["aws.region"] = args.region
 
-    run_download(args.config, overrides=overrides)
+    run_download(args.config, overrides=overrides, parallel_datasets=args.parallel_datasets)
 
 
 if __name__ == "__main__":
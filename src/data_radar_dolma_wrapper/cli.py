@@ -19,6 +19,12 @@ def main(argv: list[str] | None = None) -> int:
     dl.add_argument("--storage", type=str, choices=["local", "s3", "both"], help="Override storage mode")
     dl.add_argument("--s3-bucket", type=str, help="Override aws.s3_bucket")
     dl.add_argument("--region", type=str, help="Override aws.region")
+    dl.add_argument(
+        "--parallel-datasets",
+        type=int,
+        default=1,
+        help="Process up to N datasets concurrently in separate processes (default: 1)",
+    )
 
     args = parser.parse_args(argv)
 
@@ -32,7 +38,7 @@ def main(argv: list[str] | None = None) -> int:
             overrides["aws.s3_bucket"] = args.s3_bucket
         if args.region:
             overrides["aws.region"] = args.region
-        run_download(args.config, overrides=overrides)
+        run_download(args.config, overrides=overrides, parallel_datasets=args.parallel_datasets)
         return 0
 
     parser.print_help()
@@ -1,73 +1,295 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import json
 import os
-import subprocess
+import pickle
 import tempfile
+import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from itertools import islice
+from itertools import islice, repeat
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import yaml
 
-from .processing import DolmaToolkitPIIMasker, mask_spans, normalize_text, stable_id
+try:
+    from yaml import CSafeLoader as _YamlLoader  # LibYAML-backed parser
+except ImportError:  # pragma: no cover - PyYAML built without LibYAML
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import xxhash  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    xxhash = None
+
+from .processing import (
+    DolmaToolkitPIIMasker,
+    make_pii_masker,
+    mask_spans,
+    normalize_text,
+    stable_id,
+    stable_id_from_seed,
+    stable_id_seed,
+)
 from . import __version__ as WRAPPER_VERSION
 
 
+def _take(dataset, n: int):
+    # HF IterableDataset.take() pushes the cap into the source (no fetching past
+    # the last needed page); plain iterables fall back to islice.
+    take = getattr(dataset, "take", None)
+    if callable(take):
+        return take(n)
+    return islice(dataset, n)
+
+
 def apply_limit(dataset, limit_cfg: dict, mode: str):
     """Apply test limits to dataset based on configuration"""
     if mode == "full" or limit_cfg["type"] == "none":
         return dataset
     if limit_cfg["type"] == "rows":
-        return islice(dataset, limit_cfg["value"])
+        return _take(dataset, limit_cfg["value"])
     if limit_cfg["type"] == "percent":
         percent = limit_cfg["value"]
         # For streaming datasets, approximate
-        return islice(dataset, int(10000 * percent / 100))  # Approximate
+        return _take(dataset, int(10000 * percent / 100))  # Approximate
     raise ValueError(f"Unknown limit type: {limit_cfg['type']}")
 
 
+def _json_line(record: dict) -> bytes:
+    """Serialize one record as a UTF-8 JSONL line (orjson when available)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(record) + b"\n"
+        except TypeError:
+            # e.g. non-str keys or ints beyond 64 bits; stdlib json is more lenient
+            pass
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _doc_line(doc: dict, static_md: dict, static_md_json: bytes) -> bytes:
+    """
+    JSONL line for `doc`, whose `metadata` holds only per-doc keys. `static_md`
+    (shared by every doc of a stream, pre-serialized once as `static_md_json`)
+    is spliced in ahead of them instead of being re-serialized per record.
+    """
+    doc_md = doc.get("metadata")
+    if not doc_md:
+        md_json = static_md_json
+    elif not static_md or doc_md.keys() & static_md.keys():
+        md_json = _json_line({**static_md, **doc_md})[:-1]
+    else:
+        md_json = static_md_json[:-1] + b"," + _json_line(doc_md)[1:-1]
+    rest = {k: v for k, v in doc.items() if k != "metadata"}
+    head = _json_line(rest)[:-2] + b"," if rest else b"{"
+    return head + b'"metadata":' + md_json + b"}\n"
+
+
+_S3_CLIENT: Optional[Any] = None
+_S3_CLIENT_PID: Optional[int] = None
+_S3_CLIENT_LOCK = threading.Lock()
+
+
+def _get_s3_client():
+    """
+    Process-wide S3 client. boto3 clients are thread-safe but expensive to build
+    (config/credential resolution, connection pool), so shard uploads share one.
+    Re-created after fork so worker processes don't reuse the parent's sockets.
+    """
+    global _S3_CLIENT, _S3_CLIENT_PID
+    pid = os.getpid()
+    if _S3_CLIENT is None or _S3_CLIENT_PID != pid:
+        with _S3_CLIENT_LOCK:
+            if _S3_CLIENT is None or _S3_CLIENT_PID != pid:
+                import boto3  # type: ignore
+                from botocore.config import Config  # type: ignore
+
+                _S3_CLIENT = boto3.client(
+                    "s3",
+                    config=Config(
+                        max_pool_connections=32,
+                        retries={"max_attempts": 10, "mode": "adaptive"},
+                        tcp_keepalive=True,
+                        s3={"use_accelerate_endpoint": False, "addressing_style": "virtual"},
+                    ),
+                )
+                _S3_CLIENT_PID = pid
+    return _S3_CLIENT
+
+
+_S3_PART_SIZE = 16 * 1024 * 1024
+
+
+class _S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only stream into s3://bucket/key that uploads as it fills.
+
+    Bytes are buffered up to `part_size`; each full buffer is sent as an
+    UploadPart (the multipart upload is created on the first one). Objects that
+    never fill a part go up as a single PutObject. With an `executor`, parts are
+    uploaded in the background; `slots` (a semaphore shared between writers)
+    caps how many part buffers are held in memory at once.
+
+    close() uploads the tail and completes the upload. Leaving a `with` block on
+    an exception, or calling abort(), discards it instead; an unclosed writer
+    never completes its upload.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        *,
+        part_size: int = _S3_PART_SIZE,
+        executor: Optional[ThreadPoolExecutor] = None,
+        slots: Optional[threading.Semaphore] = None,
+    ) -> None:
+        super().__init__()
+        self._s3 = client
+        self._bucket = bucket
+        self._key = key
+        self._part_size = part_size
+        self._executor = executor
+        self._slots = slots
+        self._buf = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: list = []  # part dicts, or futures resolving to them
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if self.closed:
+            raise ValueError("write to closed file")
+        n = len(b)
+        self._buf += b
+        if len(self._buf) >= self._part_size:
+            self._send_part(background=True)
+        return n
+
+    def _upload_part(self, part_number: int, data: bytes) -> dict:
+        try:
+            resp = self._s3.upload_part(
+                Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, PartNumber=part_number, Body=data
+            )
+            return {"PartNumber": part_number, "ETag": resp["ETag"]}
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def _send_part(self, *, background: bool) -> None:
+        if self._upload_id is None:
+            resp = self._s3.create_multipart_upload(Bucket=self._bucket, Key=self._key)
+            self._upload_id = resp["UploadId"]
+        data = bytes(self._buf)
+        self._buf.clear()
+        part_number = len(self._parts) + 1
+        if self._slots is not None:
+            self._slots.acquire()
+        if background and self._executor is not None:
+            self._parts.append(self._executor.submit(self._upload_part, part_number, data))
+        else:
+            self._parts.append(self._upload_part(part_number, data))
+
+    def _collect_parts(self) -> list:
+        return [p.result() if isinstance(p, Future) else p for p in self._parts]
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._s3.put_object(Bucket=self._bucket, Key=self._key, Body=bytes(self._buf))
+            else:
+                if self._buf:
+                    self._send_part(background=False)
+                self._s3.complete_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": self._collect_parts()},
+                )
+        except BaseException:
+            try:
+                self._abort_upload()
+            except Exception:
+                pass
+            raise
+        finally:
+            self._buf = bytearray()
+            super().close()
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._abort_upload()
+        finally:
+            self._buf = bytearray()
+            super().close()
+
+    def _abort_upload(self) -> None:
+        if self._upload_id is None:
+            return
+        for p in self._parts:
+            if isinstance(p, Future):
+                try:
+                    p.result()
+                except Exception:
+                    pass
+        self._s3.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+        self._upload_id = None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __del__(self) -> None:
+        # IOBase.__del__ would close(), i.e. publish a possibly partial object.
+        pass
+
+
+_LOCAL_WRITE_BUFFER = 4 * 1024 * 1024
+
+
 def save_jsonl_local(records, filepath: str) -> None:
     """Save records to local JSONL file"""
     Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-    with open(filepath, "w", encoding="utf-8") as f:
+    # Binary BufferedWriter with a 4 MiB buffer: one write() syscall per ~4 MiB
+    # instead of one per default-sized (8 KiB) chunk.
+    with open(filepath, "wb", buffering=_LOCAL_WRITE_BUFFER) as f:
         for r in records:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            f.write(_json_line(r))
 
 
 def upload_jsonl_to_s3(records, bucket: str, key: str) -> None:
-    """Upload records to S3 as JSONL"""
-    body = "\n".join(json.dumps(r, ensure_ascii=False) for r in records).encode("utf-8")
-
-    # Prefer boto3 when it imports cleanly; otherwise fall back to AWS CLI.
-    try:
-        import boto3  # type: ignore
-
-        s3 = boto3.client("s3")
-        s3.put_object(Bucket=bucket, Key=key, Body=body)
-        return
-    except Exception:
-        pass
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jsonl") as tmp:
-        tmp.write(body)
-        tmp_path = tmp.name
-
-    try:
-        s3_url = f"s3://{bucket}/{key}"
-        subprocess.run(["aws", "s3", "cp", tmp_path, s3_url], check=True)
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
+    """Upload records to S3 as JSONL, streamed in multipart parts"""
+    with _S3MultipartWriter(_get_s3_client(), bucket, key) as w:
+        for r in records:
+            w.write(_json_line(r))
 
 
 def save_records(records, mode: str, local_path: str, bucket: str, s3_key: str) -> None:
-    """Save records based on storage mode"""
+    """
+    Save records based on storage mode.
+
+    Public helper for callers that already hold a batch of records;
+    process_stream streams its shards into its own sinks and doesn't use it.
+    """
     if mode in ("local", "both"):
         save_jsonl_local(records, local_path)
     if mode in ("s3", "both"):
@@ -120,55 +342,184 @@ def _build_doc(
     record: dict,
     dcfg: dict,
     extra_metadata: dict,
+    text_field: str | None = None,
+    id_seed=None,
 ) -> dict:
-    text_field = dcfg.get("text_field", "text")
-    raw_text = record.get(text_field, "")
-    text = raw_text if isinstance(raw_text, str) else str(raw_text)
+    if text_field is None:
+        text_field = dcfg.get("text_field", "text")
+    return _doc_from_fields(
+        dataset_name=dataset_name,
+        raw_text=record.get(text_field, ""),
+        upstream_id=record.get("id") or record.get("_id") or record.get("doc_id"),
+        created=record.get("created", ""),
+        added=record.get("added", ""),
+        version=record.get("version"),
+        extra_metadata=extra_metadata,
+        id_seed=id_seed,
+    )
+
+
+def _doc_from_fields(
+    *,
+    dataset_name: str,
+    raw_text: Any,
+    upstream_id: Any,
+    created: Any,
+    added: Any,
+    version: Any,
+    extra_metadata: dict,
+    id_seed=None,
+) -> dict:
+    text = raw_text if type(raw_text) is str else str(raw_text)
 
-    upstream_id = record.get("id") or record.get("_id") or record.get("doc_id")
-    doc_id = str(upstream_id) if upstream_id is not None else stable_id(dataset_name, text)
+    if upstream_id is not None:
+        doc_id = str(upstream_id)
+    elif id_seed is not None:
+        doc_id = stable_id_from_seed(id_seed, text)
+    else:
+        doc_id = stable_id(dataset_name, text)
 
     return {
         "id": doc_id,
         "text": text,
         "source": dataset_name,
-        "created": record.get("created", ""),
-        "added": record.get("added", ""),
-        "version": record.get("version"),
-        "metadata": extra_metadata or {},
+        "created": created,
+        "added": added,
+        "version": version,
+        # Own dict per doc: process_doc adds per-doc keys (pii_masked, ...).
+        "metadata": dict(extra_metadata) if extra_metadata else {},
     }
 
 
+# Rows per batch when reading from a HF dataset.
+_READ_BATCH_SIZE = 1024
+
+
+def _iter_column_batches(dataset: Any, columns: Iterable[str], batch_size: int = _READ_BATCH_SIZE):
+    """
+    Yield `(num_rows, {column: list})` for a HF dataset, reading `batch_size`
+    rows per call into the library and converting only `columns` to Python
+    objects. Columns missing from the dataset are left out of the dict.
+    """
+    try:
+        batches, arrow = dataset.with_format("arrow").iter(batch_size=batch_size), True
+    except (AttributeError, NotImplementedError, ValueError):
+        # Older `datasets` without Arrow formatting on IterableDataset.
+        batches, arrow = dataset.iter(batch_size=batch_size), False
+
+    for batch in batches:
+        if arrow:
+            names = set(batch.column_names)
+            yield batch.num_rows, {c: batch.column(c).to_pylist() for c in columns if c in names}
+        else:
+            n = len(next(iter(batch.values()))) if batch else 0
+            yield n, {c: batch[c] for c in columns if c in batch}
+
+
+def _docs_from_batch(
+    *,
+    dataset_name: str,
+    num_rows: int,
+    cols: Dict[str, list],
+    text_field: str,
+    id_seed=None,
+) -> Iterator[dict]:
+    """Batch counterpart of `_build_doc`, with the same defaults for missing columns."""
+
+    def col(name: str, default: Any):
+        values = cols.get(name)
+        return values if values is not None else repeat(default, num_rows)
+
+    for raw_text, id_, _id, doc_id, created, added, version in zip(
+        col(text_field, ""),
+        col("id", None),
+        col("_id", None),
+        col("doc_id", None),
+        col("created", ""),
+        col("added", ""),
+        col("version", None),
+    ):
+        yield _doc_from_fields(
+            dataset_name=dataset_name,
+            raw_text=raw_text,
+            upstream_id=id_ or _id or doc_id,
+            created=created,
+            added=added,
+            version=version,
+            extra_metadata={},
+            id_seed=id_seed,
+        )
+
+
+def _text_fingerprint(text: str) -> Tuple[int, int]:
+    """Cheap content key for `text`: (length, 64-bit hash). xxh3 when installed."""
+    if xxhash is not None:
+        try:
+            return len(text), xxhash.xxh3_64_intdigest(text)
+        except UnicodeEncodeError:  # lone surrogates
+            pass
+    return len(text), hash(text)
+
+
+_PII_CACHE_SIZE = 4096
+
+
 class ProcessingPipeline:
     def __init__(self, cfg: dict) -> None:
         self.cfg = cfg
         self._masker_cache: Dict[str, DolmaToolkitPIIMasker] = {}
+        # PII spans by text fingerprint: boilerplate repeated verbatim across docs
+        # (cookie banners, notices) is only tagged once. FIFO-bounded; reset per shard.
+        self._pii_cache: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+        # Resolve the config once; process_doc runs per record and only reads these.
+        pcfg = _get_processing_cfg(cfg)
+        ncfg = (pcfg.get("normalize") or {}) if isinstance(pcfg.get("normalize"), dict) else {}
+        dtcfg = (pcfg.get("dolma_toolkit") or {}) if isinstance(pcfg.get("dolma_toolkit"), dict) else {}
+        self.enabled = bool(pcfg.get("enabled", False))
+        self.normalize_enabled = bool(ncfg.get("enabled", True))
+        self.unicode_form = ncfg.get("unicode_form", "NFC")
+        self.collapse_whitespace = ncfg.get("collapse_whitespace", True)
+        self.pii_enabled = bool(dtcfg.get("enabled", False))
+        self.tagger_name = dtcfg.get("pii_tagger", "pii_regex_v2")
+        self.pii_engine = dtcfg.get("engine", "dolma")
+        self.mask_token = dtcfg.get("mask_token", "<PII>")
+
+    def reset_pii_cache(self) -> None:
+        self._pii_cache.clear()
+
+    def _find_pii_spans(self, masker: DolmaToolkitPIIMasker, doc: dict) -> List[Tuple[int, int]]:
+        # Dolma's PII taggers only look at the text, so spans can be shared across docs.
+        key = _text_fingerprint(doc["text"])
+        spans = self._pii_cache.get(key)
+        if spans is None:
+            spans = masker.find_pii_spans(doc_id=doc["id"], text=doc["text"], source=doc["source"])
+            if len(self._pii_cache) >= _PII_CACHE_SIZE:
+                del self._pii_cache[next(iter(self._pii_cache))]
+            self._pii_cache[key] = spans
+        return spans
 
     def process_doc(self, *, doc: dict) -> dict:
-        pcfg = _get_processing_cfg(self.cfg)
-        if not pcfg.get("enabled", False):
+        if not self.enabled:
             return doc
 
-        ncfg = (pcfg.get("normalize") or {}) if isinstance(pcfg.get("normalize"), dict) else {}
-        if ncfg.get("enabled", True):
+        if self.normalize_enabled:
             doc["text"] = normalize_text(
                 doc.get("text", ""),
-                unicode_form=ncfg.get("unicode_form", "NFC"),
-                collapse_whitespace=ncfg.get("collapse_whitespace", True),
+                unicode_form=self.unicode_form,
+                collapse_whitespace=self.collapse_whitespace,
             )
 
-        dtcfg = (pcfg.get("dolma_toolkit") or {}) if isinstance(pcfg.get("dolma_toolkit"), dict) else {}
-        if dtcfg.get("enabled", False):
+        if self.pii_enabled:
             try:
-                tagger_name = dtcfg.get("pii_tagger", "pii_regex_v2")
-                masker = self._masker_cache.get(tagger_name)
+                masker = self._masker_cache.get(self.tagger_name)
                 if masker is None:
-                    masker = DolmaToolkitPIIMasker(tagger_name=tagger_name)
-                    self._masker_cache[tagger_name] = masker
+                    masker = make_pii_masker(self.tagger_name, engine=self.pii_engine)
+                    self._masker_cache[self.tagger_name] = masker
 
-                spans = masker.find_pii_spans(doc_id=doc["id"], text=doc["text"], source=doc["source"])
+                spans = self._find_pii_spans(masker, doc)
                 if spans:
-                    doc["text"] = mask_spans(doc["text"], spans, mask_token=dtcfg.get("mask_token", "<PII>"))
+                    doc["text"] = mask_spans(doc["text"], spans, mask_token=self.mask_token)
                     md = doc.setdefault("metadata", {})
                     md["pii_masked"] = True
                     md["pii_span_count"] = len(spans)
@@ -181,7 +532,7 @@ class ProcessingPipeline:
 
 def process_stream(
     dataset_name: str,
-    ds_iter: Iterator[dict],
+    ds_iter: Iterable[dict],
     shard_size: int,
     cfg: dict,
     dcfg: dict,
@@ -190,7 +541,7 @@ def process_stream(
     s3_subdir: str,
 ) -> Tuple[int, int]:
     """Process streaming dataset and save in shards"""
-    buffer, shard_id, total = [], 0, 0
+    shard_id, total = 0, 0
     pipe = ProcessingPipeline(cfg)
 
     pcfg = _get_processing_cfg(cfg)
@@ -205,45 +556,220 @@ def process_stream(
         else:
             extra_md["run"] = dict(run_md)
 
-    for r in ds_iter:
-        doc = _build_doc(dataset_name=dataset_name, record=r, dcfg=dcfg, extra_metadata=extra_md)
-        doc = pipe.process_doc(doc=doc)
-        buffer.append(doc)
-        total += 1
-
-        if len(buffer) >= shard_size:
-            shard = f"part-{shard_id:05d}.jsonl"
-            save_records(
-                buffer,
-                cfg["storage"]["mode"],
-                os.path.join(cfg["storage"]["local_dir"], local_subdir, shard),
-                cfg["aws"]["s3_bucket"],
-                f"{cfg['aws']['s3_prefix']}/{s3_subdir}/{shard}",
-            )
-            buffer.clear()
-            shard_id += 1
+    # Shared by every record: serialized once and spliced into each line, while
+    # docs only carry their own metadata keys.
+    static_md_json = _json_line(extra_md)[:-1]
 
-    if buffer:
+    # Resolved once per stream rather than per record.
+    text_field = dcfg.get("text_field", "text")
+    id_seed = stable_id_seed(dataset_name)
+
+    # HF datasets are read in column batches (one call into the library per
+    # batch, and only the fields we use are converted); plain iterators of
+    # record dicts (e.g. an islice'd limit) go row by row.
+    def iter_docs() -> Iterator[dict]:
+        if hasattr(ds_iter, "iter"):
+            columns = (text_field, "id", "_id", "doc_id", "created", "added", "version")
+            for num_rows, cols in _iter_column_batches(ds_iter, columns):
+                yield from _docs_from_batch(
+                    dataset_name=dataset_name,
+                    num_rows=num_rows,
+                    cols=cols,
+                    text_field=text_field,
+                    id_seed=id_seed,
+                )
+        else:
+            for r in ds_iter:
+                yield _build_doc(
+                    dataset_name=dataset_name,
+                    record=r,
+                    dcfg=dcfg,
+                    extra_metadata={},
+                    text_field=text_field,
+                    id_seed=id_seed,
+                )
+
+    docs = iter_docs()
+
+    # Shard destinations only differ by file name; resolve the rest once.
+    storage_mode = cfg["storage"]["mode"]
+    to_local = storage_mode in ("local", "both")
+    to_s3 = storage_mode in ("s3", "both")
+    local_base = os.path.join(cfg["storage"]["local_dir"], local_subdir)
+    bucket = cfg["aws"]["s3_bucket"]
+    s3_base = f"{cfg['aws']['s3_prefix']}/{s3_subdir}"
+    if to_local:
+        Path(local_base).mkdir(parents=True, exist_ok=True)
+
+    # Records are serialized as they are processed and streamed into the open
+    # shard's sinks (local file and/or S3 multipart upload), so memory stays at a
+    # few part buffers rather than a whole shard. S3 parts upload on `part_pool`;
+    # each shard's tail + CompleteMultipartUpload runs on `finisher` so
+    # processing carries on into the next shard meanwhile. Both are capped at
+    # `upload_concurrency * 2` buffers in flight.
+    upload_workers = max(1, int((cfg.get("storage") or {}).get("upload_concurrency", 4)))
+    part_slots = threading.BoundedSemaphore(upload_workers * 2)
+    finishing: deque[Future] = deque()
+    s3_client = _get_s3_client() if to_s3 else None
+    local_file = None
+    local_path: Optional[str] = None
+    s3_writer: Optional[_S3MultipartWriter] = None
+    in_shard = 0
+
+    def open_shard() -> None:
+        nonlocal local_file, local_path, s3_writer
         shard = f"part-{shard_id:05d}.jsonl"
-        save_records(
-            buffer,
-            cfg["storage"]["mode"],
-            os.path.join(cfg["storage"]["local_dir"], local_subdir, shard),
-            cfg["aws"]["s3_bucket"],
-            f"{cfg['aws']['s3_prefix']}/{s3_subdir}/{shard}",
-        )
+        if to_local:
+            local_path = os.path.join(local_base, shard)
+            local_file = open(local_path, "wb", buffering=_LOCAL_WRITE_BUFFER)
+        if to_s3:
+            s3_writer = _S3MultipartWriter(
+                s3_client, bucket, f"{s3_base}/{shard}", executor=part_pool, slots=part_slots
+            )
+
+    def close_shard() -> None:
+        nonlocal local_file, local_path, s3_writer
+        pipe.reset_pii_cache()
+        if local_file is not None:
+            local_file.close()
+            local_file = None
+            local_path = None
+        if s3_writer is not None:
+            # Each queued close holds its shard's unsent tail (all of a shard
+            # smaller than one part), so bound the backlog like part buffers.
+            while len(finishing) >= upload_workers * 2:
+                finishing.popleft().result()
+            finishing.append(finisher.submit(s3_writer.close))
+            s3_writer = None
+        while finishing and finishing[0].done():
+            finishing.popleft().result()
+
+    with ThreadPoolExecutor(max_workers=upload_workers) as part_pool, ThreadPoolExecutor(
+        max_workers=upload_workers
+    ) as finisher:
+        try:
+            for doc in docs:
+                doc = pipe.process_doc(doc=doc)
+                if in_shard == 0:
+                    open_shard()
+                line = _doc_line(doc, extra_md, static_md_json)
+                if local_file is not None:
+                    local_file.write(line)
+                if s3_writer is not None:
+                    s3_writer.write(line)
+                in_shard += 1
+                total += 1
+
+                if in_shard >= shard_size:
+                    close_shard()
+                    in_shard = 0
+                    shard_id += 1
+
+            if in_shard:
+                close_shard()
+        except BaseException:
+            # Don't leave a truncated shard behind that looks complete.
+            if local_file is not None:
+                local_file.close()
+                try:
+                    os.unlink(local_path)
+                except OSError:
+                    pass
+            if s3_writer is not None:
+                s3_writer.abort()
+            raise
+
+        while finishing:
+            finishing.popleft().result()
 
     return total, shard_id + 1
 
 
-def run_download(config_path: str, *, overrides: dict | None = None) -> None:
+def _cfg_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "drdw"
+
+
+def _load_cfg_cached(path: str) -> dict:
+    """
+    Load the YAML config, reusing a pickled copy from the per-user cache dir
+    while the file's (mtime_ns, size) is unchanged. Any cache problem falls
+    back to parsing the YAML.
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache_dir = _cfg_cache_dir()
+    cache_path = cache_dir / f"cfg_{hashlib.sha1(os.path.abspath(path).encode()).hexdigest()}.pkl"
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_stamp, cached_cfg = pickle.load(f)
+        if cached_stamp == stamp:
+            return cached_cfg
+    except Exception:
+        pass
+
+    with open(path, "r", encoding="utf-8") as f:
+        cfg = yaml.load(f, Loader=_YamlLoader)
+
+    tmp_path = None
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as tmp:
+            tmp_path = tmp.name
+            pickle.dump((stamp, cfg), tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    return cfg
+
+
+def _run_one_dataset(name: str, dcfg: dict, cfg: dict, run_md: dict, mode: str) -> float:
+    """Download/process/save one dataset. Returns elapsed seconds, or -1 on failure."""
     # Import lazily to avoid importing optional heavy deps at module import time.
     from datasets import load_dataset  # type: ignore
 
+    start = time.time()
+    try:
+        if name == "sangraha":
+            for lang in dcfg["languages"]:
+                lang_dcfg = dict(dcfg)
+                base_md = (dcfg.get("metadata") or {}) if isinstance(dcfg.get("metadata"), dict) else {}
+                lang_dcfg["metadata"] = {**base_md, "lang": lang}
+                ds = load_dataset(dcfg["repo"], dcfg["subset"], split=lang, streaming=True)
+                ds_iter = apply_limit(ds, dcfg["test_limit"], mode)
+                process_stream(
+                    "sangraha",
+                    ds_iter,
+                    10_000,
+                    cfg,
+                    lang_dcfg,
+                    run_md,
+                    f"{dcfg['local_path']}/{lang}",
+                    f"{dcfg['s3_path']}/{lang}",
+                )
+        else:
+            load_args = {"path": dcfg["repo"], "split": dcfg.get("split", "train"), "streaming": True}
+            if "name" in dcfg:
+                load_args["name"] = dcfg["name"]
+            ds = load_dataset(**load_args)
+            ds_iter = apply_limit(ds, dcfg["test_limit"], mode)
+            process_stream(name, ds_iter, 10_000, cfg, dcfg, run_md, dcfg["local_path"], dcfg["s3_path"])
+
+        return time.time() - start
+    except Exception:
+        return -1
+
+
+def run_download(config_path: str, *, overrides: dict | None = None, parallel_datasets: int = 1) -> None:
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Config file not found: {config_path}")
-    with open(config_path, "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
+    cfg = _load_cfg_cached(config_path)
 
     overrides = overrides or {}
     for dotted_key, value in overrides.items():
@@ -259,37 +785,20 @@ def run_download(config_path: str, *, overrides: dict | None = None) -> None:
     times: Dict[str, float] = {}
     total_start = time.time()
 
-    for name, dcfg in cfg["datasets"].items():
-        start = time.time()
-        try:
-            if name == "sangraha":
-                for lang in dcfg["languages"]:
-                    lang_dcfg = dict(dcfg)
-                    base_md = (dcfg.get("metadata") or {}) if isinstance(dcfg.get("metadata"), dict) else {}
-                    lang_dcfg["metadata"] = {**base_md, "lang": lang}
-                    ds = load_dataset(dcfg["repo"], dcfg["subset"], split=lang, streaming=True)
-                    ds_iter = apply_limit(ds, dcfg["test_limit"], mode)
-                    process_stream(
-                        "sangraha",
-                        ds_iter,
-                        10_000,
-                        cfg,
-                        lang_dcfg,
-                        run_md,
-                        f"{dcfg['local_path']}/{lang}",
-                        f"{dcfg['s3_path']}/{lang}",
-                    )
-            else:
-                load_args = {"path": dcfg["repo"], "split": dcfg.get("split", "train"), "streaming": True}
-                if "name" in dcfg:
-                    load_args["name"] = dcfg["name"]
-                ds = load_dataset(**load_args)
-                ds_iter = apply_limit(ds, dcfg["test_limit"], mode)
-                process_stream(name, ds_iter, 10_000, cfg, dcfg, run_md, dcfg["local_path"], dcfg["s3_path"])
-
-            times[name] = time.time() - start
-        except Exception:
-            times[name] = -1
+    datasets = cfg["datasets"]
+    workers = max(1, min(parallel_datasets, len(datasets)))
+    if workers == 1:
+        for name, dcfg in datasets.items():
+            times[name] = _run_one_dataset(name, dcfg, cfg, run_md, mode)
+    else:
+        # Datasets share no state, so each runs its own stream -> process -> upload
+        # pipeline in a separate process (with its own Dolma tagger instances).
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_run_one_dataset, name, dcfg, cfg, run_md, mode): name
+                for name, dcfg in datasets.items()
+            }
+            for fut in as_completed(futures):
+                times[futures[fut]] = fut.result()
 
     _ = time.time() - total_start
-
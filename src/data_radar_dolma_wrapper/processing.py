@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import hashlib
+import functools
 import re
+import sys
 import unicodedata
+import warnings
 from datetime import datetime, timezone
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from blake3 import blake3  # type: ignore
 
 from .vendor_dolma import ensure_vendor_dolma_on_path
 
@@ -13,29 +17,49 @@ def _iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-_WS_RE = re.compile(r"\s+")
-
-
 def normalize_text(text: str, *, unicode_form: str = "NFC", collapse_whitespace: bool = True) -> str:
     if text is None:
         return ""
-    if unicode_form and unicode_form.lower() != "none":
+    # ASCII is invariant under every normalization form; isascii() is a flag check.
+    if unicode_form and unicode_form.lower() != "none" and not text.isascii():
         text = unicodedata.normalize(unicode_form, text)
     # Remove NULs which can break some downstream tooling
     text = text.replace("\x00", "")
     if collapse_whitespace:
-        text = _WS_RE.sub(" ", text).strip()
+        # str.split() splits on exactly the characters `\s` matches, so this equals
+        # re.sub(r"\s+", " ", text).strip() but runs entirely in C.
+        text = " ".join(text.split())
     return text
 
 
-def stable_id(*parts: str) -> str:
-    h = hashlib.sha1()
+def _id_part_bytes(p: str) -> bytes:
+    # ASCII (the common case) skips the general UTF-8 encoder.
+    return p.encode("ascii") if p.isascii() else p.encode("utf-8", errors="ignore")
+
+
+def stable_id_seed(*parts: str):
+    """Hasher state after `parts`, for ids that share a prefix (e.g. the dataset name)."""
+    h = blake3()
     for p in parts:
         if p is None:
             continue
-        h.update(p.encode("utf-8", errors="ignore"))
+        h.update(_id_part_bytes(p))
         h.update(b"\0")
-    return h.hexdigest()
+    return h
+
+
+def stable_id(*parts: str) -> str:
+    # Internal doc id, not a security boundary: BLAKE3 (SIMD) truncated to
+    # 20 bytes keeps the 40-hex-char shape of the previous SHA-1 ids.
+    return stable_id_seed(*parts).hexdigest(length=20)
+
+
+def stable_id_from_seed(seed, text: str) -> str:
+    """Equal to stable_id(*seed_parts, text) without re-hashing the prefix."""
+    h = seed.copy()
+    h.update(_id_part_bytes(text))
+    h.update(b"\0")
+    return h.hexdigest(length=20)
 
 
 def _merge_spans(spans: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
@@ -54,16 +78,15 @@ def mask_spans(text: str, spans: Iterable[Tuple[int, int]], *, mask_token: str =
     merged = _merge_spans(spans)
     if not merged:
         return text
-    out: List[str] = []
+    # Merged spans are sorted and disjoint, so the output is just the n+1 gaps
+    # between them joined by the mask token; fill a preallocated list by index.
+    gaps: List[str] = [""] * (len(merged) + 1)
     cur = 0
-    for s, e in merged:
-        if s > cur:
-            out.append(text[cur:s])
-        out.append(mask_token)
+    for i, (s, e) in enumerate(merged):
+        gaps[i] = text[cur:s]
         cur = e
-    if cur < len(text):
-        out.append(text[cur:])
-    return "".join(out)
+    gaps[-1] = text[cur:]
+    return mask_token.join(gaps)
 
 
 class DolmaToolkitPIIMasker:
@@ -79,16 +102,34 @@ class DolmaToolkitPIIMasker:
     def __init__(self, tagger_name: str = "pii_regex_v2") -> None:
         ensure_vendor_dolma_on_path()
         from dolma import TaggerRegistry  # type: ignore
+        from dolma.core.data_types import InputSpec  # type: ignore
 
         tagger_cls = TaggerRegistry.get(tagger_name)
         self.tagger_name = tagger_name
         self.tagger = tagger_cls()
 
-    def find_pii_spans(self, *, doc_id: str, text: str, source: str) -> List[Tuple[int, int]]:
-        ensure_vendor_dolma_on_path()
-        from dolma.core.data_types import InputSpec  # type: ignore
+        # A single spec is reused for every document; taggers don't look at `added`,
+        # so one timestamp per masker is enough.
+        self._InputSpec = InputSpec
+        self._added = _iso_now()
+        self._spec = InputSpec(id="", text="", source="", created="", added=self._added, version=None)
+        try:
+            self._spec.id = ""
+            self._reuse_spec = True
+        except (AttributeError, TypeError):  # frozen spec type
+            self._reuse_spec = False
 
-        spec = InputSpec(id=doc_id, text=text, source=source, created="", added=_iso_now(), version=None)
+    def _make_spec(self, doc_id: str, text: str, source: str):
+        if self._reuse_spec:
+            spec = self._spec
+            spec.id = doc_id
+            spec.text = text
+            spec.source = source
+            return spec
+        return self._InputSpec(id=doc_id, text=text, source=source, created="", added=self._added, version=None)
+
+    def find_pii_spans(self, *, doc_id: str, text: str, source: str) -> List[Tuple[int, int]]:
+        spec = self._make_spec(doc_id, text, source)
         tag_out: Dict[str, List[Tuple[int, int, float]]] = self.tagger.tag(spec)  # type: ignore[arg-type]
         spans: List[Tuple[int, int]] = []
         for _, vals in tag_out.items():
@@ -96,3 +137,144 @@ class DolmaToolkitPIIMasker:
                 spans.append((int(s), int(e)))
         return spans
 
+
+@functools.lru_cache(maxsize=None)
+def _hs_class_mismatches(classes: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    Code points on which Python `re` and Hyperscan (UTF-8 + UCP) disagree for any
+    of the given escape classes (e.g. `\\s`, `\\d`) -- the two ship different
+    Unicode versions. Computed once per process by scanning every code point.
+    """
+    import hyperscan  # type: ignore
+
+    universe = "".join(chr(c) for c in range(sys.maxunicode + 1) if not 0xD800 <= c <= 0xDFFF)
+    data = universe.encode("utf-8")
+    hs_sets: List[set] = [set() for _ in classes]
+
+    def on_match(class_id: int, start: int, end: int, _flags: int, _ctx) -> None:
+        hs_sets[class_id].add(data[start:end].decode("utf-8"))
+
+    flags = hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    db = hyperscan.Database()
+    db.compile(expressions=[c.encode() for c in classes], ids=list(range(len(classes))), flags=[flags] * len(classes))
+    db.scan(data, match_event_handler=on_match)
+
+    diff: set = set()
+    for cls, hs_set in zip(classes, hs_sets):
+        diff |= set(re.findall(cls, universe)) ^ hs_set
+    return frozenset(diff)
+
+
+def _hs_char_class(chars: FrozenSet[str]) -> str:
+    """
+    Hyperscan character class matching exactly `chars`. Runs of consecutive code
+    points become `\\x{a}-\\x{b}` ranges; one entry per code point would exceed
+    Hyperscan's pattern length limit for large sets such as the `\\w` mismatches.
+    """
+    ranges: List[List[int]] = []
+    for cp in sorted(map(ord, chars)):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return "[" + "".join(f"\\x{{{lo:x}}}" if lo == hi else f"\\x{{{lo:x}}}-\\x{{{hi:x}}}" for lo, hi in ranges) + "]"
+
+
+# Escape classes whose Unicode tables may differ between the engines, and how to spot them in a pattern.
+_ESCAPE_CLASSES = (
+    (r"\s", re.compile(r"\\[sS]")),
+    (r"\d", re.compile(r"\\[dD]")),
+    (r"\w", re.compile(r"\\[wW]")),
+)
+
+
+class HyperscanPIIMasker(DolmaToolkitPIIMasker):
+    """
+    DolmaToolkitPIIMasker that prefilters documents with Hyperscan.
+
+    The tagger's PII patterns (`pii_type_to_regex`, as on Dolma's regex PII
+    taggers) are compiled into one Hyperscan database, and each document is
+    scanned once to learn which patterns match at all. Only those are then run
+    with Python `re`, so spans are exactly what Dolma produces while the common
+    no-PII document skips `re` entirely. Texts containing code points on which
+    the engines' Unicode classes disagree, or that aren't valid UTF-8, take the
+    plain `re` path. Patterns Hyperscan can't compile in Unicode mode (notably
+    `\\b`/`\\B`) raise RuntimeError, so make_pii_masker falls back to Dolma.
+
+    Requires `pip install hyperscan`.
+    """
+
+    def __init__(self, tagger_name: str = "pii_regex_v2") -> None:
+        try:
+            import hyperscan  # type: ignore
+        except ImportError as e:
+            raise RuntimeError("hyperscan is not installed") from e
+
+        super().__init__(tagger_name=tagger_name)
+        from dolma.core.data_types import Span  # type: ignore
+
+        regexes = getattr(self.tagger, "pii_type_to_regex", None)
+        if not isinstance(regexes, dict) or not hasattr(self.tagger, "_extract_pii_regex"):
+            raise RuntimeError(f"tagger {tagger_name!r} does not expose regex PII patterns")
+        for regex in regexes.values():
+            if not isinstance(regex.pattern, str) or regex.flags & ~re.UNICODE:
+                raise RuntimeError(f"tagger {tagger_name!r} uses regex flags hyperscan can't mirror")
+
+        sources = [regex.pattern for regex in regexes.values()]
+        expressions = [src.encode("utf-8") for src in sources]
+        classes = tuple(cls for cls, used in _ESCAPE_CLASSES if any(used.search(src) for src in sources))
+        mismatches = _hs_class_mismatches(classes) if classes else frozenset()
+        self._guard_id: Optional[int] = None
+        if mismatches:
+            self._guard_id = len(expressions)
+            expressions.append(_hs_char_class(mismatches).encode())
+
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+        db = hyperscan.Database()
+        try:
+            db.compile(expressions=expressions, ids=list(range(len(expressions))), flags=[flags] * len(expressions))
+        except hyperscan.error as e:
+            raise RuntimeError(f"hyperscan cannot compile the patterns of {tagger_name!r}: {e}") from e
+
+        self._db = db
+        self._regexes = list(regexes.items())
+        self._Span = Span
+        # Swap only the extraction step; the tagger's predict() does the rest.
+        self._re_extract = self.tagger._extract_pii_regex
+        self.tagger._extract_pii_regex = self._extract_pii_prefiltered
+
+    def _extract_pii_prefiltered(self, text: str) -> list:
+        try:
+            data = text.encode("utf-8")
+        except UnicodeEncodeError:
+            return self._re_extract(text=text)
+
+        hit: set = set()
+        self._db.scan(data, match_event_handler=lambda pattern_id, *_: hit.add(pattern_id))
+        if not hit:
+            return []
+        if self._guard_id in hit:
+            return self._re_extract(text=text)
+
+        spans = []
+        for i, (pii_type, regex) in enumerate(self._regexes):
+            if i in hit:
+                for match in regex.finditer(text):
+                    start, end = match.span()
+                    spans.append(self._Span(start=start, end=end, type=pii_type))
+        return spans
+
+
+def make_pii_masker(tagger_name: str = "pii_regex_v2", *, engine: str = "dolma") -> DolmaToolkitPIIMasker:
+    """
+    Build the PII masker for `engine` ("dolma" or "hyperscan"). If Hyperscan
+    can't be used for this tagger, warn and fall back to the Dolma tagger.
+    """
+    if engine == "hyperscan":
+        try:
+            return HyperscanPIIMasker(tagger_name=tagger_name)
+        except RuntimeError as e:
+            warnings.warn(f"Hyperscan PII engine unavailable ({e}); using Dolma's regex tagger", RuntimeWarning)
+    elif engine != "dolma":
+        raise ValueError(f"Unknown PII engine: {engine}")
+    return DolmaToolkitPIIMasker(tagger_name=tagger_name)